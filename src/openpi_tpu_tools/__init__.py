@@ -6,6 +6,7 @@ This package provides:
 - admin helpers (kill JAX, clean tmp, nuke)
 - list/delete helpers
 - a unified watch-and-run launcher for v4/v5/v6
+- asyncio variants of the read-only operations
 """
 
 from .config import TPUEnvConfig
@@ -13,9 +14,19 @@ from .ssh import SSHOptions
 from .tpu import TPUManager
 
 __all__ = [
+    "AsyncTPUManager",
     "SSHOptions",
     "TPUEnvConfig",
     "TPUManager",
 ]
 
 PROJECT_NAME = "openpi-cot"
+
+
+def __getattr__(name: str):
+    # Imported on first use so the CLI doesn't pay for asyncio at startup
+    if name == "AsyncTPUManager":
+        from .async_tpu import AsyncTPUManager
+
+        return AsyncTPUManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+"""Asyncio variants of TPUManager's read-only operations.
+
+Worker fan-outs drive ssh/gcloud through asyncio subprocesses and describes run
+the synchronous describe path in a thread, so callers can overlap describes
+across versions, or a worker probe with a sleep, on one event loop. Results
+share the synchronous describe cache and SSH connection pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+import os
+import signal
+from typing import Literal
+
+from .ssh import CapturedProcess
+from .ssh import direct_worker_argv
+from .ssh import discard_direct_worker
+from .ssh import mark_worker_ready
+from .ssh import tpu_ssh_argv
+from .tpu import ACTIVITY_PROBE_BYTES
+from .tpu import ACTIVITY_PROBE_SHELL
+from .tpu import FANOUT_MAX_WORKERS
+from .tpu import TPUManager
+from .tpu import print_worker_output
+from .tpu import probe_results_busy
+
+
+async def _run(argv: Sequence[str], timeout_s: float, *, input: bytes | None = None) -> CapturedProcess:
+    # Own process group, so a timeout also kills grandchildren (gcloud's ssh) that hold the pipes
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(input), timeout_s)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        out, err = await proc.communicate()
+        # Same code timeout(1) uses, so callers see what run_with_timeout would return
+        return CapturedProcess(list(argv), 124, out, err)
+    return CapturedProcess(list(argv), proc.returncode if proc.returncode is not None else 1, out, err)
+
+
+@dataclass
+class AsyncTPUManager:
+    """Coroutine versions of describe/tmux_ls/check_activity on top of a TPUManager."""
+
+    mgr: TPUManager
+
+    async def describe(self, version: Literal["v4", "v5", "v6"]) -> str:
+        # In a thread so async describes take the same cache/SDK/REST/gcloud path as sync ones
+        return await asyncio.to_thread(self.mgr.describe, version)
+
+    async def describe_all(self, versions: Sequence[Literal["v4", "v5", "v6"]]) -> dict[str, str]:
+        states = await asyncio.gather(*(self.describe(v) for v in versions))
+        return dict(zip(versions, states))
+
+    async def _fanout_capture(
+        self,
+        version: Literal["v4", "v5", "v6"],
+        command: str,
+        workers: list[int],
+        *,
+        input: bytes | None = None,
+        no_shell_rc: bool = False,
+    ) -> list[tuple[int, CapturedProcess]]:
+        # Same cap as the threaded fan-out: stay under sshd's default MaxStartups.
+        limit = asyncio.Semaphore(FANOUT_MAX_WORKERS)
+        env = self.mgr.env
+        zone = self.mgr._zone_for(version)
+
+        async def run_one(worker: int) -> tuple[int, CapturedProcess]:
+            # Same routing as the threaded fan-out: direct ssh first, gcloud if that returns 255
+            target = {"tpu_name": env.tpu_name, "project": env.tpu_project, "zone": zone, "worker": str(worker)}
+            timeout_s = self.mgr.ssh.total_timeout_s
+            async with limit:
+                argv = direct_worker_argv(**target, command=command, ssh=self.mgr.ssh, no_shell_rc=no_shell_rc)
+                if argv is not None:
+                    proc = await _run(argv, timeout_s, input=input)
+                    if proc.returncode != 255:
+                        return worker, proc
+                    discard_direct_worker(**target)
+                argv = tpu_ssh_argv(**target, command=command, ssh=self.mgr.ssh, no_shell_rc=no_shell_rc)
+                proc = await _run(argv, timeout_s, input=input)
+                if proc.returncode != 255:
+                    mark_worker_ready(**target)
+                return worker, proc
+
+        return list(await asyncio.gather(*(run_one(w) for w in workers)))
+
+    async def tmux_ls(self, version: Literal["v4", "v5", "v6"]) -> bool:
+        workers = await asyncio.to_thread(self.mgr.fanout_workers, version)
+        if not workers:
+            return await asyncio.to_thread(self.mgr.tmux_ls, version)
+        results = await self._fanout_capture(version, "tmux ls || true", workers)
+        for worker, proc in results:
+            print_worker_output(worker, proc)
+        return all(proc.returncode == 0 for _, proc in results)
+
+    async def check_activity(self, version: Literal["v4", "v5", "v6"]) -> bool:
+        """Return True if busy, False if idle. Failures => busy (conservative)."""
+        workers = await asyncio.to_thread(self.mgr.fanout_workers, version)
+        if not workers:
+            return await asyncio.to_thread(self.mgr.check_activity, version)
+        results = await self._fanout_capture(
+            version, ACTIVITY_PROBE_SHELL, workers, input=ACTIVITY_PROBE_BYTES, no_shell_rc=True
+        )
+        return probe_results_busy(results)
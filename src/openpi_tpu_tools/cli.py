@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 
 from .config import TPUEnvConfig
@@ -11,6 +12,9 @@ def _add_common(p: argparse.ArgumentParser) -> None:
     p.add_argument("version", choices=["v4", "v5", "v6"], help="TPU version to target")
 
 
+# Built once per process and shared; callers must not add arguments or change
+# defaults on the returned parser.
+@functools.cache
 def build_parser() -> argparse.ArgumentParser:
     prog_name = (sys.argv[0].rsplit("/", 1)[-1] or "tpu") if getattr(sys, "argv", None) else "tpu"
     ap = argparse.ArgumentParser(prog=prog_name, description="Unified TPU utilities for v4/v5/v6")
@@ -110,12 +114,12 @@ def main(argv: list[str] | None = None) -> int:
         ok = mgr.tmux(ns.version, cmd=cmd, session=ns.session)
         return 0 if ok else 1
     if ns.cmd == "attach":
-        return mgr.attach(ns.version, session=ns.session, worker=ns.worker)
+        return mgr.attach(ns.version, session=ns.session, worker=ns.worker, replace_process=True)
     if ns.cmd == "tmux-ls":
         ok = mgr.tmux_ls(ns.version)
         return 0 if ok else 1
     if ns.cmd == "tail":
-        return mgr.tail_log(ns.version, worker=ns.worker)
+        return mgr.tail_log(ns.version, worker=ns.worker, replace_process=True)
     if ns.cmd == "tmux-kill-all":
         ok = mgr.tmux_kill_all(ns.version)
         return 0 if ok else 1
@@ -138,7 +142,7 @@ def main(argv: list[str] | None = None) -> int:
         # Otherwise, treat as a raw remote command
         cmd = " ".join(ns.rest) if getattr(ns, "rest", None) else ""
         worker = None if getattr(ns, "worker", None) is None else str(ns.worker)
-        return mgr.raw(ns.cmd, cmd=cmd, worker=(worker or "all"))
+        return mgr.raw(ns.cmd, cmd=cmd, worker=(worker or "all"), replace_process=True)
     ap.error("Unknown command")
     return 2
 
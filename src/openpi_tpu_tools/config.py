@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from dataclasses import field
 import os
+from types import MappingProxyType
 
 
 @dataclass(frozen=True)
@@ -21,6 +24,15 @@ class TPUEnvConfig:
     wandb_api_key: str
     gh_token: str
     gh_owner: str
+    # Read-only version -> zone/bucket maps, built once in __post_init__
+    zones: Mapping[str, str] = field(init=False, repr=False, compare=False)
+    buckets: Mapping[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        zones = {"v4": self.tpu_zone_v4, "v5": self.tpu_zone_v5, "v6": self.tpu_zone_v6}
+        buckets = {"v4": self.tpu_bucket_v4, "v5": self.tpu_bucket_v5, "v6": self.tpu_bucket_v6}
+        object.__setattr__(self, "zones", MappingProxyType(zones))
+        object.__setattr__(self, "buckets", MappingProxyType(buckets))
 
     @staticmethod
     def from_env() -> TPUEnvConfig:
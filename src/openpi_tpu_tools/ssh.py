@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from dataclasses import field
+import functools
+import getpass
 import os
+import selectors
+import shlex
 import shutil
 import subprocess
+import sys
+from typing import NoReturn
 
 
+@functools.cache
 def _which_timeout() -> str:
+    # Resolved once per process: TIMEOUT_BIN and PATH are read on first use only.
     env_val = os.environ.get("TIMEOUT_BIN", "timeout").strip()
     if shutil.which(env_val):
         return env_val
@@ -18,6 +27,18 @@ def _which_timeout() -> str:
     return "timeout"
 
 
+_DEFAULT_KEY_FILE = os.path.expanduser("~/.ssh/google_compute_engine")
+
+# Every TPU VM command goes through the same gcloud surface
+_GCLOUD_PREFIX = ("gcloud", "alpha", "compute", "tpus", "tpu-vm")
+
+# Where gcloud pins TPU VM host keys, under HostKeyAlias=tpu.<node id>-<worker>
+_GCLOUD_KNOWN_HOSTS = os.path.expanduser("~/.ssh/google_compute_known_hosts")
+
+# Tunnel through IAP if requested (helps when port 22 is blocked); read once at import.
+_USE_IAP = os.environ.get("GCLOUD_TPU_USE_IAP", "").strip() not in {"", "0", "false", "False"}
+
+
 @dataclass(frozen=True)
 class SSHOptions:
     connect_timeout_s: int = int(os.environ.get("SSH_CONNECT_TIMEOUT", 12))
@@ -27,97 +48,418 @@ class SSHOptions:
     kill_after_s: int = int(os.environ.get("SSH_KILL_AFTER", 5))
     key_file: str | None = os.environ.get("GCLOUD_SSH_KEY_FILE")
     forward_agent: bool = os.environ.get("SSH_FORWARD_AGENT", "1") != "0"
+    # Multiplex later sessions over one authenticated connection per host
+    control_master: str = os.environ.get("SSH_CONTROL_MASTER", "auto")
+    control_path: str = os.environ.get("SSH_CONTROL_PATH", "~/.ssh/cm-%C")
+    control_persist: str = os.environ.get("SSH_CONTROL_PERSIST", "600")
+    # key_file if it exists, checked once at construction
+    _resolved_key_file: str | None = field(init=False, repr=False, compare=False, default=None)
+    # Identity for direct ssh: key_file, else gcloud's default key, if present
+    _identity_file: str | None = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self) -> None:
+        resolved = self.key_file if self.key_file and os.path.exists(self.key_file) else None
+        identity = resolved or (_DEFAULT_KEY_FILE if os.path.exists(_DEFAULT_KEY_FILE) else None)
+        object.__setattr__(self, "_resolved_key_file", resolved)
+        object.__setattr__(self, "_identity_file", identity)
 
     def to_ssh_flags(self) -> list[str]:
         flags: list[str] = [
-            "-o",
-            "BatchMode=yes",
-            "-o",
-            f"ConnectTimeout={self.connect_timeout_s}",
-            "-o",
-            f"ServerAliveInterval={self.alive_interval_s}",
-            "-o",
-            f"ServerAliveCountMax={self.alive_count_max}",
+            *self._session_flags(),
             "-o",
             "StrictHostKeyChecking=accept-new",
             "-o",
             "UserKnownHostsFile=/dev/null",
         ]
+        for opt in self._control_options():
+            flags += ["-o", opt]
         # Forward agent if enabled and an agent socket is present
         if self.forward_agent and os.environ.get("SSH_AUTH_SOCK"):
             flags.append("-A")
         return flags
 
+    def to_direct_ssh_flags(self, host_key_alias: str) -> list[str]:
+        """Flags for ssh straight to a worker IP, verified against the host key gcloud pinned.
+
+        An unknown or changed key fails the connection (rc 255, so callers retry
+        through gcloud). The agent is never forwarded on this path.
+        """
+        flags: list[str] = [
+            *self._session_flags(),
+            "-o",
+            "StrictHostKeyChecking=yes",
+            "-o",
+            f"UserKnownHostsFile={_GCLOUD_KNOWN_HOSTS}",
+            "-o",
+            f"HostKeyAlias={host_key_alias}",
+            "-o",
+            "CheckHostIP=no",
+        ]
+        for opt in self._control_options():
+            flags += ["-o", opt]
+        return flags
+
+    def _session_flags(self) -> list[str]:
+        return [
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            f"ConnectTimeout={self.connect_timeout_s}",
+            "-o",
+            f"ServerAliveInterval={self.alive_interval_s}",
+            "-o",
+            f"ServerAliveCountMax={self.alive_count_max}",
+        ]
+
+    def to_gcloud_ssh_flags(self) -> list[str]:
+        """Keepalive and multiplexing options as `--ssh-flag`s, for gcloud's `--worker=all` mode."""
+        opts = [f"ServerAliveInterval={self.alive_interval_s}", f"ServerAliveCountMax={self.alive_count_max}"]
+        return [f"--ssh-flag=-o{opt}" for opt in opts + self._control_options()]
+
+    def _control_options(self) -> list[str]:
+        return [
+            f"ControlMaster={self.control_master}",
+            f"ControlPath={self.control_path}",
+            f"ControlPersist={self.control_persist}",
+        ]
+
+
+class CapturedProcess:
+    """Result of run_with_timeout.
+
+    Output is captured as bytes; `stdout`/`stderr` decode lazily on first access.
+    """
+
+    def __init__(self, args: list[str], returncode: int, stdout_bytes: bytes, stderr_bytes: bytes) -> None:
+        self.args = args
+        self.returncode = returncode
+        self.stdout_bytes = stdout_bytes
+        self.stderr_bytes = stderr_bytes
+
+    @functools.cached_property
+    def stdout(self) -> str:
+        return self.stdout_bytes.decode("utf-8", "replace")
+
+    @functools.cached_property
+    def stderr(self) -> str:
+        return self.stderr_bytes.decode("utf-8", "replace")
+
+
+def run_with_timeout(
+    timeout_s: int,
+    kill_after_s: int,
+    argv: Sequence[str],
+    *,
+    input: bytes | None = None,
+    max_stderr_bytes: int | None = None,
+) -> CapturedProcess:
+    """Run `argv` under `timeout`, capturing output; `input` is fed to its stdin if given.
 
-def run_with_timeout(timeout_s: int, kill_after_s: int, argv: Sequence[str]) -> subprocess.CompletedProcess:
+    With `max_stderr_bytes`, only that many trailing bytes of stderr are kept
+    (error lines come last), so a long traceback is never buffered in full.
+    """
     timeout_bin = _which_timeout()
     cmd = [timeout_bin, "-k", f"{kill_after_s}s", f"{timeout_s}s", *argv]
-    return subprocess.run(cmd, check=False, capture_output=True, text=True)
+    if max_stderr_bytes is None or input is not None:
+        proc = subprocess.run(cmd, check=False, capture_output=True, input=input)
+        return CapturedProcess(cmd, proc.returncode, proc.stdout, proc.stderr)
+    with subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        out, err = bytearray(), bytearray()
+        with selectors.DefaultSelector() as sel:
+            sel.register(proc.stdout, selectors.EVENT_READ, out)
+            sel.register(proc.stderr, selectors.EVENT_READ, err)
+            while sel.get_map():
+                for key, _ in sel.select():
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        continue
+                    key.data.extend(chunk)
+                    if key.data is err and len(err) > max_stderr_bytes:
+                        del err[:-max_stderr_bytes]
+        returncode = proc.wait()
+    return CapturedProcess(cmd, returncode, bytes(out), bytes(err))
 
 
-def run_streaming(argv: Sequence[str]) -> int:
+def run_streaming(argv: Sequence[str], *, input: bytes | None = None) -> int:
     """Run a command and stream stdout/stderr directly to the terminal.
 
     This avoids wrapping with a timeout and does not capture output, matching
-    interactive behavior (e.g., tail -f).
+    interactive behavior (e.g., tail -f). `input` is fed to its stdin if given.
     """
     try:
-        proc = subprocess.run(list(argv), check=False)
+        proc = subprocess.run(list(argv), check=False, input=input)
         return proc.returncode
     except KeyboardInterrupt:
         # Propagate a conventional exit code for SIGINT
         return 130
 
 
-def gcloud_tpu_ssh(
+def run_exec(argv: Sequence[str]) -> NoReturn:
+    """Replace the current process with `argv`.
+
+    For terminal actions (attach, tail): no Python process stays resident and
+    signals go straight to the child.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(argv[0], list(argv))
+
+
+def _describe_argv(project: str, zone: str, name: str) -> list[str]:
+    return [*_GCLOUD_PREFIX, "describe", name, "--zone", zone, "--project", project, "--format", "json"]
+
+
+def _remote_argv(command: str, *, no_shell_rc: bool) -> list[str]:
+    # ssh joins the remote argv with spaces, so the script must travel as one quoted word
+    if no_shell_rc:
+        return ["bash", "--noprofile", "--norc", "-lc", shlex.quote(command)]
+    return ["bash", "-lc", shlex.quote(command)]
+
+
+def worker_ip(endpoint: dict) -> str:
+    """A describe `networkEndpoints` entry's external IP, else its internal one ("" if neither)."""
+    return (endpoint.get("accessConfig") or {}).get("externalIp") or endpoint.get("ipAddress", "")
+
+
+def direct_ssh_available(ssh: SSHOptions) -> bool:
+    """Whether workers can be reached with plain ssh (needs a key and no IAP tunnel)."""
+    return not _USE_IAP and ssh._identity_file is not None
+
+
+class SSHConnectionPool:
+    """Reuse authenticated SSH channels to individual TPU workers.
+
+    The first call for a (tpu, worker) pair goes through gcloud, which handles
+    key propagation and leaves a ControlMaster socket behind. Later calls ssh
+    straight to the worker IP and multiplex over that socket, skipping gcloud
+    startup and the SSH handshake. Worker IPs only come from the cached describe
+    (see `seed`); until a TPU was seeded, every call goes through gcloud.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: dict[tuple[str, str, str], list[str]] = {}
+        # TPU node ids, for the host key aliases gcloud pins worker keys under
+        self._node_ids: dict[tuple[str, str, str], str] = {}
+        self._ready: set[tuple[str, str, str, str]] = set()
+        # Workers where direct ssh returned 255 (e.g. OS Login user mismatch); gcloud only from then on
+        self._failed: set[tuple[str, str, str, str]] = set()
+
+    def endpoints(self, *, tpu_name: str, project: str, zone: str) -> list[str] | None:
+        """Worker IPs (external if present, else internal) seeded from the cached describe, or None."""
+        return self._endpoints.get((project, zone, tpu_name))
+
+    def seed(self, *, tpu_name: str, project: str, zone: str, ips: list[str], node_id: str | None) -> None:
+        """Record worker IPs and the node id resolved elsewhere (e.g. from a cached describe)."""
+        key = (project, zone, tpu_name)
+        self._endpoints[key] = ips
+        if node_id:
+            self._node_ids[key] = node_id
+        else:
+            self._node_ids.pop(key, None)
+
+    def forget(self, tpu_name: str) -> None:
+        """Drop cached endpoints and masters for `tpu_name` (e.g. after it was recreated)."""
+        self._endpoints = {k: v for k, v in self._endpoints.items() if k[2] != tpu_name}
+        self._node_ids = {k: v for k, v in self._node_ids.items() if k[2] != tpu_name}
+        self._ready = {k for k in self._ready if k[2] != tpu_name}
+        self._failed = {k for k in self._failed if k[2] != tpu_name}
+
+    def mark_ready(self, *, tpu_name: str, project: str, zone: str, worker: str) -> None:
+        self._ready.add((project, zone, tpu_name, worker))
+
+    def discard(self, *, tpu_name: str, project: str, zone: str, worker: str) -> None:
+        """Direct ssh to this worker failed; stop trying it until the TPU is forgotten."""
+        self._ready.discard((project, zone, tpu_name, worker))
+        self._failed.add((project, zone, tpu_name, worker))
+
+    def direct_argv(
+        self, *, tpu_name: str, project: str, zone: str, worker: str, ssh: SSHOptions, direct: bool = False
+    ) -> list[str] | None:
+        """Build a direct `ssh user@ip` argv, or None if no master was established yet.
+
+        With `direct`, also try workers without a known master as long as an
+        identity file is available; the caller falls back to gcloud on failure.
+        """
+        if not worker.isdigit():
+            return None
+        key = (project, zone, tpu_name, worker)
+        if key in self._failed:
+            return None
+        if key not in self._ready and not (direct and ssh._identity_file):
+            return None
+        ips = self.endpoints(tpu_name=tpu_name, project=project, zone=zone)
+        idx = int(worker)
+        node_id = self._node_ids.get((project, zone, tpu_name))
+        # Without the node id there's no pinned host key to check the worker against
+        if ips is None or idx >= len(ips) or not ips[idx] or not node_id:
+            return None
+        argv = ["ssh", *ssh.to_direct_ssh_flags(f"tpu.{node_id}-{idx}")]
+        if ssh._identity_file:
+            argv += ["-i", ssh._identity_file]
+        user = os.environ.get("GCLOUD_SSH_USER") or getpass.getuser()
+        argv.append(f"{user}@{ips[idx]}")
+        return argv
+
+
+_POOL = SSHConnectionPool()
+
+
+def forget_tpu(tpu_name: str) -> None:
+    """Forget pooled endpoints for `tpu_name`; its worker IPs may have changed."""
+    _POOL.forget(tpu_name)
+
+
+def seed_worker_endpoints(*, tpu_name: str, project: str, zone: str, ips: list[str], node_id: str | None) -> None:
+    """Hand the SSH pool worker IPs and the node id from the cached describe; direct ssh needs both."""
+    _POOL.seed(tpu_name=tpu_name, project=project, zone=zone, ips=ips, node_id=node_id)
+
+
+def direct_worker_argv(
+    *, tpu_name: str, project: str, zone: str, worker: str, command: str, ssh: SSHOptions, no_shell_rc: bool = False
+) -> list[str] | None:
+    """Argv to ssh straight to `worker` (as gcloud_tpu_ssh's `direct` does), or None to go through gcloud."""
+    return _pooled_argv(
+        tpu_name=tpu_name,
+        project=project,
+        zone=zone,
+        worker=worker,
+        command=command,
+        ssh=ssh,
+        allocate_tty=False,
+        no_shell_rc=no_shell_rc,
+        direct=True,
+    )
+
+
+def discard_direct_worker(*, tpu_name: str, project: str, zone: str, worker: str) -> None:
+    """Record that direct ssh to `worker` failed (rc 255), so later calls go through gcloud."""
+    _POOL.discard(tpu_name=tpu_name, project=project, zone=zone, worker=worker)
+
+
+def mark_worker_ready(*, tpu_name: str, project: str, zone: str, worker: str) -> None:
+    """Record that gcloud reached `worker`, leaving a master later calls can ssh over directly."""
+    _POOL.mark_ready(tpu_name=tpu_name, project=project, zone=zone, worker=worker)
+
+
+def _pooled_argv(
     *,
     tpu_name: str,
     project: str,
     zone: str,
-    worker: str | None = None,
-    command: str | None = None,
-    extra_args: Iterable[str] | None = None,
-    ssh: SSHOptions | None = None,
-    allocate_tty: bool = False,
-    no_shell_rc: bool = False,
-) -> subprocess.CompletedProcess:
-    ssh = ssh or SSHOptions()
-    args: list[str] = [
-        "gcloud",
-        "alpha",
-        "compute",
-        "tpus",
-        "tpu-vm",
-        "ssh",
-        tpu_name,
-        "--project",
-        project,
-        "--zone",
-        zone,
-    ]
-    # Allow tunneling through IAP if requested (helps when port 22 is blocked)
-    if os.environ.get("GCLOUD_TPU_USE_IAP", "").strip() not in {"", "0", "false", "False"}:
+    worker: str | None,
+    command: str | None,
+    ssh: SSHOptions,
+    allocate_tty: bool,
+    no_shell_rc: bool,
+    direct: bool = False,
+) -> list[str] | None:
+    # Direct ssh cannot follow an IAP tunnel; those calls always go through gcloud.
+    if worker is None or worker == "all" or _USE_IAP:
+        return None
+    argv = _POOL.direct_argv(
+        tpu_name=tpu_name, project=project, zone=zone, worker=str(worker), ssh=ssh, direct=direct
+    )
+    if argv is None:
+        return None
+    if allocate_tty:
+        argv[-1:-1] = ["-t", "-t"]  # keep the destination last
+    argv.append("--")
+    if command:
+        argv += _remote_argv(command, no_shell_rc=no_shell_rc)
+    return argv
+
+
+def _build_gcloud_ssh_argv(
+    *,
+    tpu_name: str,
+    project: str,
+    zone: str,
+    worker: str | None,
+    command: str | None,
+    extra_args: Iterable[str] | None,
+    ssh: SSHOptions,
+    allocate_tty: bool,
+    no_shell_rc: bool,
+) -> list[str]:
+    args = [*_GCLOUD_PREFIX, "ssh", tpu_name, "--project", project, "--zone", zone]
+    if _USE_IAP:
         args.append("--tunnel-through-iap")
     if worker is not None:
         args += ["--worker", str(worker)]
-    if ssh.key_file and os.path.exists(ssh.key_file):
-        args += ["--ssh-key-file", ssh.key_file]
+    if ssh._resolved_key_file:
+        args += ["--ssh-key-file", ssh._resolved_key_file]
     if worker == "all":
+        args.extend(ssh.to_gcloud_ssh_flags())
         if command:
             args += ["--command", command]
-        return run_with_timeout(ssh.total_timeout_s, ssh.kill_after_s, args)
+        return args
     if extra_args:
-        args.extend(list(extra_args))
+        args.extend(extra_args)
     args.append("--")
     args.extend(ssh.to_ssh_flags())
     if allocate_tty:
-        args.extend(["-t", "-t"])  # force TTY allocation
+        args += ["-t", "-t"]  # force TTY allocation
     if command:
-        if no_shell_rc:
-            args += ["bash", "--noprofile", "--norc", "-lc", command]
-        else:
-            args += ["bash", "-lc", command]
-    return run_with_timeout(ssh.total_timeout_s, ssh.kill_after_s, args)
+        args += _remote_argv(command, no_shell_rc=no_shell_rc)
+    return args
+
+
+def gcloud_tpu_ssh(
+    *,
+    tpu_name: str,
+    project: str,
+    zone: str,
+    worker: str | None = None,
+    command: str | None = None,
+    extra_args: Iterable[str] | None = None,
+    ssh: SSHOptions | None = None,
+    allocate_tty: bool = False,
+    no_shell_rc: bool = False,
+    input: bytes | None = None,
+    direct: bool = False,
+) -> CapturedProcess:
+    """Run gcloud TPU SSH under a timeout and capture its output.
+
+    `input` is sent to the remote command's stdin (e.g. a script for `bash -s`).
+    With `direct`, ssh straight to the worker IP even before a pooled master
+    exists; a connection failure (rc 255) retries through gcloud.
+    """
+    ssh = ssh or SSHOptions()
+    pooled = None
+    if not extra_args:
+        pooled = _pooled_argv(
+            tpu_name=tpu_name,
+            project=project,
+            zone=zone,
+            worker=worker,
+            command=command,
+            ssh=ssh,
+            allocate_tty=allocate_tty,
+            no_shell_rc=no_shell_rc,
+            direct=direct,
+        )
+    if pooled is not None:
+        proc = run_with_timeout(ssh.total_timeout_s, ssh.kill_after_s, pooled, input=input)
+        if proc.returncode != 255:
+            return proc
+        # No usable master and the key was not accepted directly; retry through gcloud
+        _POOL.discard(tpu_name=tpu_name, project=project, zone=zone, worker=str(worker))
+    args = _build_gcloud_ssh_argv(
+        tpu_name=tpu_name,
+        project=project,
+        zone=zone,
+        worker=worker,
+        command=command,
+        extra_args=extra_args,
+        ssh=ssh,
+        allocate_tty=allocate_tty,
+        no_shell_rc=no_shell_rc,
+    )
+    proc = run_with_timeout(ssh.total_timeout_s, ssh.kill_after_s, args, input=input)
+    if proc.returncode != 255 and worker is not None and worker != "all":
+        _POOL.mark_ready(tpu_name=tpu_name, project=project, zone=zone, worker=str(worker))
+    return proc
 
 
 def gcloud_tpu_ssh_stream(
@@ -131,45 +473,117 @@ def gcloud_tpu_ssh_stream(
     ssh: SSHOptions | None = None,
     allocate_tty: bool = False,
     no_shell_rc: bool = False,
+    input: bytes | None = None,
 ) -> int:
     """Run gcloud TPU SSH and stream output live without a timeout wrapper.
 
-    Intended for long-running interactive commands like tail -f.
+    Intended for long-running interactive commands like tail -f. `input` is
+    fed to the remote command's stdin; gcloud's `--worker=all` mode doesn't
+    forward it to every worker, so pass it for a single worker only.
     """
     ssh = ssh or SSHOptions()
-    args: list[str] = [
-        "gcloud",
-        "alpha",
-        "compute",
-        "tpus",
-        "tpu-vm",
-        "ssh",
-        tpu_name,
-        "--project",
-        project,
-        "--zone",
-        zone,
-    ]
-    # Allow tunneling through IAP if requested (helps when port 22 is blocked)
-    if os.environ.get("GCLOUD_TPU_USE_IAP", "").strip() not in {"", "0", "false", "False"}:
-        args.append("--tunnel-through-iap")
-    if worker is not None:
-        args += ["--worker", str(worker)]
-    if ssh.key_file and os.path.exists(ssh.key_file):
-        args += ["--ssh-key-file", ssh.key_file]
-    if worker == "all":
-        if command:
-            args += ["--command", command]
-        return run_streaming(args)
-    if extra_args:
-        args.extend(list(extra_args))
-    args.append("--")
-    args.extend(ssh.to_ssh_flags())
-    if allocate_tty:
-        args.extend(["-t", "-t"])  # force TTY allocation
-    if command:
-        if no_shell_rc:
-            args += ["bash", "--noprofile", "--norc", "-lc", command]
-        else:
-            args += ["bash", "-lc", command]
-    return run_streaming(args)
+    pooled = None
+    if not extra_args:
+        pooled = _pooled_argv(
+            tpu_name=tpu_name,
+            project=project,
+            zone=zone,
+            worker=worker,
+            command=command,
+            ssh=ssh,
+            allocate_tty=allocate_tty,
+            no_shell_rc=no_shell_rc,
+        )
+    if pooled is not None:
+        rc = run_streaming(pooled, input=input)
+        if rc != 255:
+            return rc
+        # The master went away and the key was not accepted directly; retry through gcloud
+        _POOL.discard(tpu_name=tpu_name, project=project, zone=zone, worker=str(worker))
+    args = _build_gcloud_ssh_argv(
+        tpu_name=tpu_name,
+        project=project,
+        zone=zone,
+        worker=worker,
+        command=command,
+        extra_args=extra_args,
+        ssh=ssh,
+        allocate_tty=allocate_tty,
+        no_shell_rc=no_shell_rc,
+    )
+    rc = run_streaming(args, input=input)
+    if rc != 255 and worker is not None and worker != "all":
+        _POOL.mark_ready(tpu_name=tpu_name, project=project, zone=zone, worker=str(worker))
+    return rc
+
+
+def tpu_ssh_argv(
+    *,
+    tpu_name: str,
+    project: str,
+    zone: str,
+    worker: str | None = None,
+    command: str | None = None,
+    extra_args: Iterable[str] | None = None,
+    ssh: SSHOptions | None = None,
+    allocate_tty: bool = False,
+    no_shell_rc: bool = False,
+) -> list[str]:
+    """Return the argv for one SSH call: a pooled direct ssh if a master is known, else gcloud."""
+    ssh = ssh or SSHOptions()
+    args = None
+    if not extra_args:
+        args = _pooled_argv(
+            tpu_name=tpu_name,
+            project=project,
+            zone=zone,
+            worker=worker,
+            command=command,
+            ssh=ssh,
+            allocate_tty=allocate_tty,
+            no_shell_rc=no_shell_rc,
+        )
+    if args is None:
+        args = _build_gcloud_ssh_argv(
+            tpu_name=tpu_name,
+            project=project,
+            zone=zone,
+            worker=worker,
+            command=command,
+            extra_args=extra_args,
+            ssh=ssh,
+            allocate_tty=allocate_tty,
+            no_shell_rc=no_shell_rc,
+        )
+    return args
+
+
+def gcloud_tpu_ssh_exec(
+    *,
+    tpu_name: str,
+    project: str,
+    zone: str,
+    worker: str | None = None,
+    command: str | None = None,
+    extra_args: Iterable[str] | None = None,
+    ssh: SSHOptions | None = None,
+    allocate_tty: bool = False,
+    no_shell_rc: bool = False,
+) -> NoReturn:
+    """Like gcloud_tpu_ssh_stream, but exec the SSH client in place of this process.
+
+    There is no gcloud fallback once exec'd, so a pooled direct ssh is only used
+    when a master for the worker is already known.
+    """
+    args = tpu_ssh_argv(
+        tpu_name=tpu_name,
+        project=project,
+        zone=zone,
+        worker=worker,
+        command=command,
+        extra_args=extra_args,
+        ssh=ssh,
+        allocate_tty=allocate_tty,
+        no_shell_rc=no_shell_rc,
+    )
+    run_exec(args)
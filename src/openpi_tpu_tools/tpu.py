@@ -1,59 +1,355 @@
 from __future__ import annotations
 
-import base64
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import functools
 import os
 import re
 import shlex
-from typing import Literal
+import threading
+import time
+from typing import Any, Literal
 
 from .config import TPUEnvConfig
+from .ssh import _GCLOUD_PREFIX
+from .ssh import CapturedProcess
 from .ssh import SSHOptions
+from .ssh import _describe_argv
+from .ssh import direct_ssh_available
+from .ssh import forget_tpu
 from .ssh import gcloud_tpu_ssh
+from .ssh import gcloud_tpu_ssh_exec
 from .ssh import gcloud_tpu_ssh_stream
 from .ssh import run_streaming
 from .ssh import run_with_timeout
+from .ssh import seed_worker_endpoints
+from .ssh import worker_ip
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup, see the `fast` extra
+    from json import loads as _json_loads
+
+# Concurrent SSH sessions per fan-out; stays under sshd's default MaxStartups=10.
+FANOUT_MAX_WORKERS = 8
+
+# Keeps status lines from concurrent describes from interleaving.
+_print_lock = threading.Lock()
 
-def _ts() -> str:
-    from datetime import datetime
 
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _ts() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
 
 DescribeRC = Literal[0, 1, 2]
 
 
-def _gcloud_describe_state(project: str, zone: str, name: str, timeout_s: int) -> tuple[DescribeRC, str]:
-    proc = run_with_timeout(
-        timeout_s,
-        int(os.environ.get("SSH_KILL_AFTER", 5)),
-        [
-            "gcloud",
-            "alpha",
-            "compute",
-            "tpus",
-            "tpu-vm",
-            "describe",
-            name,
-            "--zone",
-            zone,
-            "--project",
-            project,
-            "--format",
-            "value(state)",
-        ],
-    )
+# Matched against gcloud's raw error output to map describe failures to a state.
+_NOT_FOUND_RE = re.compile(rb"not[\s_]*found|404", re.I)
+_PERMISSION_RE = re.compile(rb"permission_denied|forbidden|403", re.I)
+_INVALID_ZONE_RE = re.compile(rb"invalid value for \[--zone\]|argument --zone", re.I)
+# A worker's probe printed "busy" on a line of its own.
+_BUSY_RE = re.compile(rb"(^|\r?\n)busy(\r?\n|$)")
+
+# Successful describe results are reused for this many seconds (0 disables caching).
+DESCRIBE_CACHE_TTL_S = float(os.environ.get("DESCRIBE_CACHE_TTL", 10))
+
+_describe_cache: dict[tuple[str, str, str], tuple[float, dict[str, Any]]] = {}
+
+
+def invalidate_describe(name: str) -> None:
+    """Drop cached describe results for TPU `name` (call after state-changing operations)."""
+    for key in [k for k in _describe_cache if k[2] == name]:
+        _describe_cache.pop(key, None)
+    forget_tpu(name)
+
+
+def _describe_cache_get(key: tuple[str, str, str]) -> dict[str, Any] | None:
+    hit = _describe_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < DESCRIBE_CACHE_TTL_S:
+        return hit[1]
+    return None
+
+
+def _describe_cache_put(key: tuple[str, str, str], node: dict[str, Any]) -> None:
+    _describe_cache[key] = (time.monotonic(), node)
+
+
+def _gcloud_describe(project: str, zone: str, name: str, timeout_s: int) -> tuple[DescribeRC, dict[str, Any]]:
+    """Describe TPU `name` as a JSON dict, cached for DESCRIBE_CACHE_TTL_S.
+
+    Errors that map to a definite state come back as rc 0 with a synthetic
+    ``{"state": ...}`` node; other failures carry their message under ``"error"``.
+    """
+    key = (project, zone, name)
+    node = _describe_cache_get(key)
+    if node is not None:
+        return 0, node
+    result = None
+    if _USE_SDK and _tpu_client() is not None:
+        result = _sdk_describe(project, zone, name, timeout_s)
+    if result is None and _USE_REST:
+        result = _rest_describe(project, zone, name, timeout_s)
+    if result is not None:
+        rc, node = result
+    else:
+        proc = run_with_timeout(
+            timeout_s,
+            int(os.environ.get("SSH_KILL_AFTER", 5)),
+            _describe_argv(project, zone, name),
+            max_stderr_bytes=4096,
+        )
+        rc, node = _parse_describe(proc)
+    if rc == 0:
+        _describe_cache_put(key, node)
+    return rc, node
+
+
+# Cleared once application default credentials are rejected; they can be stale or belong
+# to a different account than gcloud's login, so REST/gcloud answer from then on.
+_USE_SDK = True
+
+
+@functools.cache
+def _tpu_client() -> Any | None:
+    """Shared TPU API client, or None to describe through gcloud instead.
+
+    Falls back when google-cloud-tpu isn't installed or no application default
+    credentials are set up (gcloud's own login doesn't provide them).
+    """
+    # Imported on first describe, not at module load: the SDK pulls in grpc/protobuf
+    try:
+        from google.auth.exceptions import DefaultCredentialsError
+        from google.cloud import tpu_v2
+    except ImportError:  # optional, see the `sdk` extra
+        return None
+    try:
+        return tpu_v2.TpuClient()
+    except DefaultCredentialsError:
+        return None
+
+
+def _sdk_describe(project: str, zone: str, name: str, timeout_s: int) -> tuple[DescribeRC, dict[str, Any]] | None:
+    # Same result shape as _parse_describe: camelCase keys and enum names, as gcloud prints them.
+    # None means fall back to REST/gcloud.
+    from google.api_core import exceptions as api_exceptions
+    from google.auth.exceptions import GoogleAuthError
+
+    global _USE_SDK
+    try:
+        node = _tpu_client().get_node(name=f"projects/{project}/locations/{zone}/nodes/{name}", timeout=timeout_s)
+    except api_exceptions.NotFound:
+        return 0, {"state": "NOT_FOUND"}
+    except (api_exceptions.PermissionDenied, api_exceptions.Unauthenticated, GoogleAuthError):
+        _USE_SDK = False
+        return None
+    except api_exceptions.InvalidArgument:
+        return 2, {"error": "INVALID_ZONE"}
+    except api_exceptions.GoogleAPIError as e:
+        return 1, {"error": str(e).strip().splitlines()[-1] if str(e).strip() else "ERROR"}
+    return 0, type(node).to_dict(node, use_integers_for_enums=False, preserving_proto_field_name=False)
+
+
+# Describe over HTTPS with gcloud's access token (disable with DESCRIBE_REST=0).
+_USE_REST = os.environ.get("DESCRIBE_REST", "1") != "0"
+_TPU_API_HOST = "tpu.googleapis.com"
+# gcloud's access tokens last an hour; refresh a little early.
+_TOKEN_TTL_S = 55 * 60
+# After the API can't be reached, describe goes through gcloud for this long before retrying.
+_REST_BACKOFF_S = 5 * 60
+_rest_retry_at = 0.0
+
+_token: tuple[float, str] | None = None
+_token_lock = threading.Lock()
+# One kept-alive connection per thread (http.client connections aren't thread-safe).
+_http = threading.local()
+
+
+def _access_token(*, refresh: bool = False) -> str | None:
+    global _token, _USE_REST
+    with _token_lock:
+        if not refresh and _token is not None and time.monotonic() - _token[0] < _TOKEN_TTL_S:
+            return _token[1]
+        proc = run_with_timeout(20, 5, ["gcloud", "auth", "print-access-token"])
+        token = proc.stdout.strip()
+        if proc.returncode != 0 or not token:
+            # No usable login for REST; stay on the gcloud describe for this process
+            _token, _USE_REST = None, False
+            return None
+        _token = (time.monotonic(), token)
+        return token
+
+
+def _rest_request(path: str, token: str, timeout_s: int) -> tuple[int, bytes]:
+    import http.client  # only paid for once describe goes over REST
+
+    conn = getattr(_http, "conn", None)
+    if conn is None:
+        conn = _http.conn = http.client.HTTPSConnection(_TPU_API_HOST, timeout=timeout_s)
+    elif conn.sock is not None:
+        conn.sock.settimeout(timeout_s)
+    try:
+        conn.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    except (OSError, http.client.HTTPException):
+        conn.close()
+        _http.conn = None
+        raise
+
+
+def _rest_describe(project: str, zone: str, name: str, timeout_s: int) -> tuple[DescribeRC, dict[str, Any]] | None:
+    """GET the node from the TPU API; None means fall back to the gcloud describe."""
+    import http.client
+
+    global _rest_retry_at
+    if time.monotonic() < _rest_retry_at:
+        return None
+    token = _access_token()
+    if token is None:
+        return None
+    path = f"/v2/projects/{project}/locations/{zone}/nodes/{name}"
+    try:
+        try:
+            status, body = _rest_request(path, token, timeout_s)
+        except (OSError, http.client.HTTPException):
+            # A kept-alive connection may have been closed by the server; reconnect once
+            status, body = _rest_request(path, token, timeout_s)
+        if status == 401:
+            token = _access_token(refresh=True)
+            if token is None:
+                return None
+            status, body = _rest_request(path, token, timeout_s)
+    except (OSError, http.client.HTTPException):
+        # Unreachable (e.g. a network blip, or a proxy http.client doesn't use); back off
+        _rest_retry_at = time.monotonic() + _REST_BACKOFF_S
+        return None
+    if status == 200:
+        try:
+            return 0, _json_loads(body or b"{}")
+        except ValueError:
+            return 1, {"error": "Unparseable describe output"}
+    if status == 404:
+        return 0, {"state": "NOT_FOUND"}
+    if status == 403:
+        return 0, {"state": "PERMISSION_DENIED"}
+    if status == 400:
+        return 2, {"error": "INVALID_ZONE"}
+    if status == 401:
+        return None
+    return 1, {"error": f"HTTP {status} from the TPU API"}
+
+
+def _parse_describe(proc: CapturedProcess) -> tuple[DescribeRC, dict[str, Any]]:
     if proc.returncode == 0:
-        return 0, (proc.stdout.strip() or "UNKNOWN")
-    out = (proc.stderr or proc.stdout or "").lower()
-    if re.search(r"not\s*found|404", out):
-        return 0, "NOT_FOUND"
-    if re.search(r"permission_denied|forbidden|403", out):
-        return 0, "PERMISSION_DENIED"
-    if re.search(r"invalid value for \[--zone\]|argument --zone", out):
-        return 2, "INVALID_ZONE"
-    return 1, out.strip().splitlines()[-1] if out else "ERROR"
+        try:
+            return 0, _json_loads(proc.stdout_bytes or b"{}")
+        except ValueError:
+            return 1, {"error": "Unparseable describe output"}
+    out = (proc.stderr_bytes or proc.stdout_bytes).strip()
+    if _NOT_FOUND_RE.search(out):
+        return 0, {"state": "NOT_FOUND"}
+    if _PERMISSION_RE.search(out):
+        return 0, {"state": "PERMISSION_DENIED"}
+    if _INVALID_ZONE_RE.search(out):
+        return 2, {"error": "INVALID_ZONE"}
+    return 1, {"error": out.splitlines()[-1].decode("utf-8", "replace") if out else "ERROR"}
+
+
+def _gcloud_describe_state(project: str, zone: str, name: str, timeout_s: int) -> tuple[DescribeRC, str]:
+    rc, node = _gcloud_describe(project, zone, name, timeout_s)
+    if rc != 0:
+        return rc, node.get("error", "ERROR")
+    return 0, node.get("state") or "UNKNOWN"
+
+
+def _describe_field(project: str, zone: str, name: str, path: str, timeout_s: int = 20) -> Any:
+    """Look up a dotted `path` (e.g. ``networkEndpoints.0.ipAddress``) in the cached describe.
+
+    Returns None if the describe failed or any path component is missing.
+    """
+    rc, value = _gcloud_describe(project, zone, name, timeout_s)
+    if rc != 0:
+        return None
+    for part in path.split("."):
+        if isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+# One C-level grep lists the maps files that load TPU/XLA libraries (-l stops
+# reading each file at its first hit); only candidates owned by us count (the
+# [ -O ] test is a bash builtin, no fork). Then a python-process fallback for
+# hosts that have not loaded libtpu yet.
+_ACTIVITY_PROBE = (
+    "for m in $(grep -lsE 'libtpu|libxla|_xla_extension|libdevice' /proc/[0-9]*/maps); do "
+    "[ -O \"${m%/maps}\" ] && { echo busy; exit 0; }; done; "
+    "if pgrep -f '(^|/)python([0-9.])?' >/dev/null 2>&1; then echo busy; else echo idle; fi"
+)
+ACTIVITY_PROBE_BYTES = _ACTIVITY_PROBE.encode()
+# Remote command for the stdin probe; exec replaces the bash -lc wrapper instead of nesting under it.
+ACTIVITY_PROBE_SHELL = "exec bash --noprofile --norc -s"
+
+# Remote admin scripts; each is self-contained so they can also be batched (see nuke_all).
+_ADMIN_TMUX_KILL = (
+    "set -euo pipefail;"
+    "if command -v tmux >/dev/null 2>&1; then "
+    "tmux ls >/dev/null 2>&1 && tmux kill-server || true; "
+    "rm -rf /tmp/tmux-$(id -u) 2>/dev/null || true; fi"
+)
+# One grep over all of our python pids' environ files (-z makes each NUL-separated
+# entry a line, -l prints the matching files), then TERM the JAX ones, give them
+# 2s, and KILL whatever is left. The survivors are re-filtered first so a pid
+# recycled during the grace period isn't killed.
+_ADMIN_KILL_JAX = (
+    "set -euo pipefail;"
+    "jax_pids() { sed 's|.*|/proc/&/environ|' "
+    "| xargs -r grep -lszE '^(JAX_|XLA_|TPU_|LIBTPU)' | sed 's|^/proc/\\([0-9]*\\)/environ$|\\1|' || true; };"
+    "JPIDS=$({ pgrep -u $USER -f python || true; } | jax_pids);"
+    "if [ -n \"$JPIDS\" ]; then "
+    "kill -TERM $JPIDS 2>/dev/null || true; sleep 2;"
+    "JPIDS=$(printf '%s\\n' $JPIDS | jax_pids);"
+    "[ -z \"$JPIDS\" ] || kill -KILL $JPIDS 2>/dev/null || true; fi;"
+    "pgrep -a -u $USER -f python || true"
+)
+# Expand the globs once (nullglob drops the ones that match nothing), keep only
+# entries we own, and remove them all with a single rm.
+_ADMIN_CLEAN_TMP = (
+    'echo "[INFO] Cleaning /tmp and /dev/shm…";'
+    "shopt -s nullglob; F=();"
+    "for f in /tmp/{jax*,.jax*,pjrt*,xla*,libtpu*,tpu*,coordination-*,jax-mp-*} "
+    "/dev/shm/{sem.*,psm_*,jax*,xla*,pjrt*}; do [ -O \"$f\" ] && F+=(\"$f\"); done;"
+    "if [ ${#F[@]} -gt 0 ]; then printf '%s\\n' \"${F[@]}\"; rm -rf -- \"${F[@]}\" 2>/dev/null || true; fi"
+)
+# Run every step even if an earlier one fails (each in its own subshell so its
+# `set -e` stays effective), and report failure if any step failed.
+_ADMIN_NUKE = (
+    "rc=0; "
+    + "".join(f"( {script} ); [ $? -eq 0 ] || rc=1; " for script in (_ADMIN_TMUX_KILL, _ADMIN_KILL_JAX, _ADMIN_CLEAN_TMP))
+    + "exit $rc"
+)
+
+
+def print_worker_output(worker: int, proc: CapturedProcess) -> None:
+    for line in (proc.stdout + proc.stderr).splitlines():
+        print(f"[worker {worker}] {line}")
+    if proc.returncode != 0:
+        print(f"[worker {worker}] exited with rc={proc.returncode}")
+
+
+def probe_results_busy(results: list[tuple[int, CapturedProcess]]) -> bool:
+    """Whether any worker's activity probe reported busy; a failed probe counts as busy."""
+    for worker, proc in results:
+        if proc.returncode != 0:
+            print(f"{_ts()} - SSH probe failed on worker {worker} (rc={proc.returncode}); treating as busy.")
+            return True
+    return any(_BUSY_RE.search(proc.stdout_bytes) for _, proc in results)
 
 
 @dataclass
@@ -64,18 +360,104 @@ class TPUManager:
     sleep_secs: int = int(os.environ.get("SLEEP_SECS", 20))
 
     def _zone_for(self, version: Literal["v4", "v5", "v6"]) -> str:
-        return {
-            "v4": self.env.tpu_zone_v4,
-            "v5": self.env.tpu_zone_v5,
-            "v6": self.env.tpu_zone_v6,
-        }[version]
+        return self.env.zones[version]
 
     def _bucket_for(self, version: Literal["v4", "v5", "v6"]) -> str:
-        return {
-            "v4": self.env.tpu_bucket_v4,
-            "v5": self.env.tpu_bucket_v5,
-            "v6": self.env.tpu_bucket_v6,
-        }[version]
+        return self.env.buckets[version]
+
+    def _resolve_worker_endpoints(self, version: Literal["v4", "v5", "v6"]) -> list[str]:
+        """Worker IPs (external, else internal) from the cached describe; [] if unavailable.
+
+        Also hands them to the SSH pool so fan-outs can ssh to the IPs directly.
+        """
+        zone = self._zone_for(version)
+        endpoints = _describe_field(
+            self.env.tpu_project, zone, self.env.tpu_name, "networkEndpoints", self.describe_timeout_s
+        )
+        if not isinstance(endpoints, list):
+            return []
+        ips = [worker_ip(ep) for ep in endpoints]
+        node_id = _describe_field(self.env.tpu_project, zone, self.env.tpu_name, "id", self.describe_timeout_s)
+        seed_worker_endpoints(
+            tpu_name=self.env.tpu_name,
+            project=self.env.tpu_project,
+            zone=zone,
+            ips=ips,
+            node_id=str(node_id) if node_id else None,
+        )
+        return ips
+
+    def _workers(self, version: Literal["v4", "v5", "v6"]) -> list[int]:
+        return list(range(len(self._resolve_worker_endpoints(version))))
+
+    def fanout_workers(self, version: Literal["v4", "v5", "v6"]) -> list[int]:
+        """Workers to fan out to, or [] to use one gcloud `--worker=all` call instead.
+
+        Without direct ssh (IAP, or no key) each worker would cost its own gcloud
+        startup, so a single `--worker=all` call is cheaper.
+        """
+        if not direct_ssh_available(self.ssh):
+            return []
+        return self._workers(version)
+
+    def _fanout_capture(
+        self,
+        version: Literal["v4", "v5", "v6"],
+        command: str,
+        workers: list[int],
+        *,
+        input: bytes | None = None,
+        no_shell_rc: bool = False,
+    ) -> list[tuple[int, CapturedProcess]]:
+        """Run `command` on each worker concurrently and return (worker, result) in worker order."""
+        zone = self._zone_for(version)
+
+        def run_one(worker: int) -> CapturedProcess:
+            return gcloud_tpu_ssh(
+                tpu_name=self.env.tpu_name,
+                project=self.env.tpu_project,
+                zone=zone,
+                worker=str(worker),
+                command=command,
+                ssh=self.ssh,
+                no_shell_rc=no_shell_rc,
+                input=input,
+                direct=True,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(len(workers), FANOUT_MAX_WORKERS)) as pool:
+            return list(zip(workers, pool.map(run_one, workers)))
+
+    def _fanout(self, version: Literal["v4", "v5", "v6"], command: str, workers: list[int]) -> bool:
+        """Run `command` on each worker concurrently; True if every worker succeeded.
+
+        Falls back to a single gcloud `--worker=all` call when the worker list is unknown.
+        """
+        if not workers:
+            return (
+                gcloud_tpu_ssh_stream(
+                    tpu_name=self.env.tpu_name,
+                    project=self.env.tpu_project,
+                    zone=self._zone_for(version),
+                    worker="all",
+                    command=command,
+                    ssh=self.ssh,
+                )
+                == 0
+            )
+        results: list[bool] = []
+        for worker, proc in self._fanout_capture(version, command, workers):
+            print_worker_output(worker, proc)
+            results.append(proc.returncode == 0)
+        return all(results)
+
+    def _ssh_all(self, version: Literal["v4", "v5", "v6"], script: str) -> bool:
+        """Run `script` once on every worker; compose steps into one script rather than calling this per step."""
+        return self._fanout(version, script, self.fanout_workers(version))
+
+    def _argv(self, verb: str, zone: str, *extra: str) -> list[str]:
+        """gcloud argv for `verb` on this TPU, e.g. ``_argv("stop", zone)``."""
+        return [*_GCLOUD_PREFIX, verb, self.env.tpu_name, "--zone", zone, "--project", self.env.tpu_project, *extra]
 
     def describe(self, version: Literal["v4", "v5", "v6"]) -> str:
         rc, state = _gcloud_describe_state(
@@ -84,86 +466,57 @@ class TPUManager:
         if rc == 2:
             raise RuntimeError(f"Invalid zone for {version}: {self._zone_for(version)}")
         if rc != 0:
-            print(f"{_ts()} - Describe error: {state}")
+            with _print_lock:
+                print(f"{_ts()} - Describe error: {state}")
             return "ERROR"
         return state
 
+    def describe_many(self, versions: list[Literal["v4", "v5", "v6"]]) -> dict[str, str]:
+        """Describe several versions concurrently (one per zone); returns {version: state}."""
+        if not versions:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(versions)) as pool:
+            return dict(zip(versions, pool.map(self.describe, versions)))
+
+    def ip_of(self, version: Literal["v4", "v5", "v6"], worker: int = 0) -> str | None:
+        """Return a worker's external IP (internal if it has none) from the cached describe."""
+        endpoint = _describe_field(
+            self.env.tpu_project,
+            self._zone_for(version),
+            self.env.tpu_name,
+            f"networkEndpoints.{worker}",
+            self.describe_timeout_s,
+        )
+        if not endpoint:
+            return None
+        return worker_ip(endpoint) or None
+
+    def accelerator_type(self, version: Literal["v4", "v5", "v6"]) -> str | None:
+        return _describe_field(
+            self.env.tpu_project, self._zone_for(version), self.env.tpu_name, "acceleratorType", self.describe_timeout_s
+        )
+
     def delete(self, version: Literal["v4", "v5", "v6"]) -> bool:
         zone = self._zone_for(version)
-        rc = run_streaming(
-            [
-                "gcloud",
-                "alpha",
-                "compute",
-                "tpus",
-                "tpu-vm",
-                "delete",
-                self.env.tpu_name,
-                "--zone",
-                zone,
-                "--project",
-                self.env.tpu_project,
-                "--quiet",
-            ]
-        )
+        rc = run_streaming(self._argv("delete", zone, "--quiet"))
+        invalidate_describe(self.env.tpu_name)
         return rc == 0
 
     def stop(self, version: Literal["v4", "v5", "v6"]) -> bool:
         zone = self._zone_for(version)
-        rc = run_streaming(
-            [
-                "gcloud",
-                "alpha",
-                "compute",
-                "tpus",
-                "tpu-vm",
-                "stop",
-                self.env.tpu_name,
-                "--zone",
-                zone,
-                "--project",
-                self.env.tpu_project,
-            ]
-        )
+        rc = run_streaming(self._argv("stop", zone))
+        invalidate_describe(self.env.tpu_name)
         return rc == 0
 
     def start(self, version: Literal["v4", "v5", "v6"]) -> bool:
         zone = self._zone_for(version)
-        rc = run_streaming(
-            [
-                "gcloud",
-                "alpha",
-                "compute",
-                "tpus",
-                "tpu-vm",
-                "start",
-                self.env.tpu_name,
-                "--zone",
-                zone,
-                "--project",
-                self.env.tpu_project,
-            ]
-        )
+        rc = run_streaming(self._argv("start", zone))
+        invalidate_describe(self.env.tpu_name)
         return rc == 0
 
     def create(self, version: Literal["v4", "v5", "v6"], *, tpu_num: int, topology: str | None = None) -> bool:
         zone = self._zone_for(version)
-        common = [
-            "gcloud",
-            "alpha",
-            "compute",
-            "tpus",
-            "tpu-vm",
-            "create",
-            self.env.tpu_name,
-            "--zone",
-            zone,
-            "--project",
-            self.env.tpu_project,
-            "--service-account",
-            self.env.tpu_service_account,
-            "--spot",
-        ]
+        common = self._argv("create", zone, "--service-account", self.env.tpu_service_account, "--spot")
         if version == "v4":
             if not topology:
                 raise ValueError("topology is required for v4")
@@ -177,24 +530,66 @@ class TPUManager:
             args = [*common, "--accelerator-type", f"v6e-{tpu_num}", "--version", "v2-alpha-tpuv6e"]
 
         rc = run_streaming(args)
+        invalidate_describe(self.env.tpu_name)
         return rc == 0
 
-    def tmux(self, version: Literal["v4", "v5", "v6"], *, cmd: str, session: str = "tpu") -> bool:
-        # Ensure tmux exists and start/send in a session across all workers
-        line = f"set -eo pipefail; export PYTHONUNBUFFERED=1; {cmd} 2>&1 | tee -a $LOG"
-        remote = (
+    @functools.cached_property
+    def _tmux_prologue(self) -> str:
+        # Session-independent part of the tmux launch script
+        return (
             "command -v tmux >/dev/null || (sudo apt-get update && sudo apt-get install -y tmux);"
-            f"mkdir -p $HOME/{self.env.gh_repo_name}/logs;"
+            f"LOG_DIR=$HOME/{self.env.gh_repo_name}/logs;"
+            'mkdir -p "$LOG_DIR";'
             "TS=$(date +%Y%m%d-%H%M%S);"
-            f"LOG=$HOME/{self.env.gh_repo_name}/logs/{session}_$TS.log;"
+        )
+
+    @functools.cached_property
+    def _tail_log_cmd(self) -> str:
+        # Prefer tmux's LOG environment for the current session; fallback to newest in logs dir.
+        # Use -f to follow like the shell helper's v4_tail.
+        session = "tpu"
+        return (
+            f"SESSION={shlex.quote(session)}; "
+            'LOG_FILE="$(tmux show-environment -t "$SESSION" LOG 2>/dev/null | sed -n "s/^LOG=//p")"; '
+            '[ -n "$LOG_FILE" ] && [ -f "$LOG_FILE" ] && { tail -n 200 -f "$LOG_FILE"; exit $?; }; '
+            'LOG_DIR="${LOG_FILE%/*}"; '
+            f'[ -n "$LOG_DIR" ] || LOG_DIR=$HOME/{self.env.gh_repo_name}/logs; '
+            'test -d "$LOG_DIR" || { echo "[ERROR] Logs dir not found: $LOG_DIR"; exit 1; }; '
+            'F="$(ls -1t "$LOG_DIR" | head -n1 || true)"; '
+            '[ -n "$F" ] || { echo "[ERROR] No log files in $LOG_DIR"; exit 1; }; '
+            'tail -n 200 -f "$LOG_DIR/$F"'
+        )
+
+    def tmux(self, version: Literal["v4", "v5", "v6"], *, cmd: str, session: str = "tpu") -> bool:
+        # Ensure tmux exists and start/send in a session across all workers.
+        # The command goes into a script via a quoted heredoc, so it needs no escaping
+        # of its own and send-keys only types a short `bash <file>` line. The pane's
+        # output is piped to LOG by tmux itself (replacing any earlier pipe), so
+        # no tee runs alongside the command. The script may hold credentials: it is
+        # private to the user (mktemp under umask 077) and removes itself once bash
+        # has it open.
+        remote = (
+            f"{self._tmux_prologue}"
+            f"LOG=$LOG_DIR/{session}_$TS.log;"
+            f"F=$(umask 077; mktemp /tmp/tpu_cmd_{session}_XXXXXX.sh) || exit 1;"
+            "cat >\"$F\" <<'TPU_CMD_EOF'\n"
+            'rm -f -- "$0"\n'
+            "set -eo pipefail\n"
+            "export PYTHONUNBUFFERED=1\n"
+            f"{cmd}\n"
+            "TPU_CMD_EOF\n"
             f"if ! tmux has-session -t {shlex.quote(session)} 2>/dev/null; then "
             f"    tmux new-session -ds {shlex.quote(session)} -e SSH_AUTH_SOCK=$SSH_AUTH_SOCK -e LOG=$LOG; "
             "else "
             f"    tmux set-environment -t {shlex.quote(session)} LOG $LOG; "
             "fi;"
-            # Send the command and execute it
-            f"tmux send-keys -t {shlex.quote(session)} {shlex.quote(line)} Enter"
+            f'tmux pipe-pane -t {shlex.quote(session)} "cat >>$LOG";'
+            # Run the script in the session
+            f'tmux send-keys -t {shlex.quote(session)} "bash $F" Enter'
         )
+        # Streamed through one --worker=all call with no timeout: the prologue may have
+        # to install tmux (apt/dpkg locks can take minutes), and the script is not
+        # idempotent, so it must not be cut short or retried over another channel.
         return (
             gcloud_tpu_ssh_stream(
                 tpu_name=self.env.tpu_name,
@@ -207,23 +602,51 @@ class TPUManager:
             == 0
         )
 
-    def raw(self, version: Literal["v4", "v5", "v6"], *, cmd: str, worker: str | None = "all") -> int:
+    def raw(
+        self,
+        version: Literal["v4", "v5", "v6"],
+        *,
+        cmd: str,
+        worker: str | None = "all",
+        replace_process: bool = False,
+        input: bytes | None = None,
+    ) -> int:
         """Run a raw command on TPU worker(s) without tmux.
 
-        Mirrors `v4 "<cmd>"` style helpers from ~/.tpu_funcs.sh.
+        Mirrors `v4 "<cmd>"` style helpers from ~/.tpu_funcs.sh. With
+        `replace_process`, the SSH client is exec'd in place of this process;
+        otherwise `input` (single worker only) is fed to the command's stdin.
         """
+        if replace_process:
+            return gcloud_tpu_ssh_exec(
+                tpu_name=self.env.tpu_name,
+                project=self.env.tpu_project,
+                zone=self._zone_for(version),
+                worker=worker,
+                command=cmd,
+                ssh=self.ssh,
+            )
         return gcloud_tpu_ssh_stream(
             tpu_name=self.env.tpu_name,
             project=self.env.tpu_project,
             zone=self._zone_for(version),
-            worker=worker if worker is not None else None,
+            worker=worker,
             command=cmd,
             ssh=self.ssh,
+            input=input,
         )
 
-    def attach(self, version: Literal["v4", "v5", "v6"], *, session: str = "tpu", worker: int = 0) -> int:
+    def attach(
+        self,
+        version: Literal["v4", "v5", "v6"],
+        *,
+        session: str = "tpu",
+        worker: int = 0,
+        replace_process: bool = False,
+    ) -> int:
         # Use exec with `tmux new -As` to attach-or-create without running extra commands afterward
-        return gcloud_tpu_ssh_stream(
+        run = gcloud_tpu_ssh_exec if replace_process else gcloud_tpu_ssh_stream
+        return run(
             tpu_name=self.env.tpu_name,
             project=self.env.tpu_project,
             zone=self._zone_for(version),
@@ -238,116 +661,32 @@ class TPUManager:
         )
 
     def tmux_ls(self, version: Literal["v4", "v5", "v6"]) -> bool:
-        return (
-            gcloud_tpu_ssh_stream(
-                tpu_name=self.env.tpu_name,
-                project=self.env.tpu_project,
-                zone=self._zone_for(version),
-                worker="all",
-                command="tmux ls || true",
-                ssh=self.ssh,
-            )
-            == 0
-        )
+        return self._ssh_all(version, "tmux ls || true")
 
-    def tail_log(self, version: Literal["v4", "v5", "v6"], *, worker: int = 0) -> int:
-        # Prefer tmux's LOG environment for the current session; fallback to newest in logs dir.
-        # Use -f to follow like the shell helper's v4_tail.
-        session = "tpu"
-        cmd = (
-            f"SESSION={shlex.quote(session)}; "
-            'LOG_FILE="$(tmux show-environment -t "$SESSION" LOG 2>/dev/null | sed -n "s/^LOG=//p")"; '
-            '[ -n "$LOG_FILE" ] && [ -f "$LOG_FILE" ] && { tail -n 200 -f "$LOG_FILE"; exit $?; }; '
-            'LOG_DIR="${LOG_FILE%/*}"; '
-            f'[ -n "$LOG_DIR" ] || LOG_DIR=$HOME/{self.env.gh_repo_name}/logs; '
-            'test -d "$LOG_DIR" || { echo "[ERROR] Logs dir not found: $LOG_DIR"; exit 1; }; '
-            'F="$(ls -1t "$LOG_DIR" | head -n1 || true)"; '
-            '[ -n "$F" ] || { echo "[ERROR] No log files in $LOG_DIR"; exit 1; }; '
-            'tail -n 200 -f "$LOG_DIR/$F"'
-        )
-        rc = gcloud_tpu_ssh_stream(
+    def tail_log(self, version: Literal["v4", "v5", "v6"], *, worker: int = 0, replace_process: bool = False) -> int:
+        run = gcloud_tpu_ssh_exec if replace_process else gcloud_tpu_ssh_stream
+        rc = run(
             tpu_name=self.env.tpu_name,
             project=self.env.tpu_project,
             zone=self._zone_for(version),
             worker=str(worker),
-            command=cmd,
+            command=self._tail_log_cmd,
             ssh=self.ssh,
         )
         return rc
 
     def tmux_kill_all(self, version: Literal["v4", "v5", "v6"]) -> bool:
-        remote = (
-            "set -euo pipefail;"
-            "if command -v tmux >/dev/null 2>&1; then "
-            "tmux ls >/dev/null 2>&1 && tmux kill-server || true; "
-            "rm -rf /tmp/tmux-$(id -u) 2>/dev/null || true; fi"
-        )
-        return (
-            gcloud_tpu_ssh_stream(
-                tpu_name=self.env.tpu_name,
-                project=self.env.tpu_project,
-                zone=self._zone_for(version),
-                worker="all",
-                command=remote,
-                ssh=self.ssh,
-            )
-            == 0
-        )
+        return self._ssh_all(version, _ADMIN_TMUX_KILL)
 
     def kill_jax(self, version: Literal["v4", "v5", "v6"]) -> bool:
-        remote = (
-            "set -euo pipefail;"
-            "PIDS=$(pgrep -u $USER -f python || true);"
-            "for pid in $PIDS; do "
-            "if [ -r \"/proc/$pid/environ\" ] && tr '\\0' '\\n' </proc/$pid/environ 2>/dev/null | grep -qE '(^(JAX_|XLA_|TPU_|LIBTPU))'; then "
-            "kill -TERM $pid 2>/dev/null || true; fi; done;"
-            "sleep 2;"
-            "for pid in $(pgrep -u $USER -f python || true); do "
-            "if [ -r \"/proc/$pid/environ\" ] && tr '\\0' '\\n' </proc/$pid/environ 2>/dev/null | grep -qE '(^(JAX_|XLA_|TPU_|LIBTPU))'; then "
-            "kill -0 $pid 2>/dev/null && kill -KILL $pid 2>/dev/null || true; fi; done;"
-            "pgrep -a -u $USER -f python || true"
-        )
-        return (
-            gcloud_tpu_ssh_stream(
-                tpu_name=self.env.tpu_name,
-                project=self.env.tpu_project,
-                zone=self._zone_for(version),
-                worker="all",
-                command=remote,
-                ssh=self.ssh,
-            )
-            == 0
-        )
+        return self._ssh_all(version, _ADMIN_KILL_JAX)
 
     def clean_jax_tmp(self, version: Literal["v4", "v5", "v6"]) -> bool:
-        remote = (
-            'echo "[INFO] Cleaning /tmp…";'
-            "find /tmp -maxdepth 1 -user $USER "
-            "\\( -name 'jax*' -o -name '.jax*' -o -name 'pjrt*' -o -name 'xla*' "
-            "-o -name 'libtpu*' -o -name 'tpu*' -o -name 'coordination-*' -o -name 'jax-mp-*' \\) "
-            "-print -exec rm -rf {} + 2>/dev/null || true;"
-            'echo "[INFO] Cleaning /dev/shm…";'
-            "find /dev/shm -maxdepth 1 -user $USER "
-            "\\( -name 'sem.*' -o -name 'psm_*' -o -name 'jax*' -o -name 'xla*' -o -name 'pjrt*' \\) "
-            "-print -exec rm -f {} + 2>/dev/null || true"
-        )
-        return (
-            gcloud_tpu_ssh_stream(
-                tpu_name=self.env.tpu_name,
-                project=self.env.tpu_project,
-                zone=self._zone_for(version),
-                worker="all",
-                command=remote,
-                ssh=self.ssh,
-            )
-            == 0
-        )
+        return self._ssh_all(version, _ADMIN_CLEAN_TMP)
 
     def nuke_all(self, version: Literal["v4", "v5", "v6"]) -> bool:
-        ok = self.tmux_kill_all(version)
-        ok = self.kill_jax(version) and ok
-        ok = self.clean_jax_tmp(version) and ok
-        return ok
+        # One SSH session per worker for all three steps instead of three fan-outs
+        return self._ssh_all(version, _ADMIN_NUKE)
 
     def list(self, version: Literal["v4", "v5", "v6"]) -> int:
         zone = self._zone_for(version)
@@ -380,37 +719,28 @@ class TPUManager:
                 zone,
             ]
         )
+        invalidate_describe(name)
         return rc
 
     def check_activity(self, version: Literal["v4", "v5", "v6"]) -> bool:
         """Return True if busy, False if idle. Failures => busy (conservative)."""
-        probe = r"""
-        set -e -o pipefail
-        uid=$(id -u)
-        for m in /proc/*/maps; do
-        [ -r "$m" ] || continue
-        if grep -qE 'libtpu|libxla|_xla_extension|libdevice' "$m" 2>/dev/null; then
-            pid=${m%/maps}; pid=${pid#/proc/}
-            puid=$(awk '/^Uid:/ {print $2}' "/proc/$pid/status" 2>/dev/null || echo -1)
-            if [ "$puid" = "$uid" ]; then
-            echo busy; exit 0
-            fi
-        fi
-        done
-        if pgrep -af '(^|/)python([0-9.])?' >/dev/null 2>&1; then echo busy; exit 0; fi
-        echo idle
-        """
-        encoded = base64.b64encode(probe.encode()).decode().replace("\n", "")
-        # Use non-streaming so we can parse the result.
-        proc = gcloud_tpu_ssh(
-            tpu_name=self.env.tpu_name,
-            project=self.env.tpu_project,
-            zone=self._zone_for(version),
-            worker="all",
-            command=f"bash -lc 'echo {encoded} | base64 -d | bash -s'",
-            ssh=self.ssh,
+        workers = self.fanout_workers(version)
+        if not workers:
+            # Use non-streaming so we can parse the result.
+            proc = gcloud_tpu_ssh(
+                tpu_name=self.env.tpu_name,
+                project=self.env.tpu_project,
+                zone=self._zone_for(version),
+                worker="all",
+                command=_ACTIVITY_PROBE,
+                ssh=self.ssh,
+            )
+            if proc.returncode != 0:
+                print(f"{_ts()} - SSH probe failed (rc={proc.returncode}); treating as busy.")
+                return True
+            return bool(_BUSY_RE.search(proc.stdout_bytes))
+        # Per worker over the pooled channel; the probe goes in on stdin, no quoting or encoding.
+        results = self._fanout_capture(
+            version, ACTIVITY_PROBE_SHELL, workers, input=ACTIVITY_PROBE_BYTES, no_shell_rc=True
         )
-        if proc.returncode != 0:
-            print(f"{_ts()} - SSH probe failed (rc={proc.returncode}); treating as busy.")
-            return True
-        return bool(re.search(r"(^|\r?\n)busy(\r?\n|$)", proc.stdout))
+        return probe_results_busy(results)
@@ -3,18 +3,21 @@ from __future__ import annotations
 import argparse
 import base64
 from dataclasses import dataclass
-from datetime import datetime
+import functools
+import os
+import selectors
 import signal
 from string import Template
 import sys
-from time import sleep
+import time
 
 from .config import TPUEnvConfig
 from .tpu import TPUManager
+from .tpu import invalidate_describe
 
 
 def _ts() -> str:
-    return datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
 
 def _map_v4_topology(tpu_num: int) -> str:
@@ -24,6 +27,59 @@ def _map_v4_topology(tpu_num: int) -> str:
     return mapping[tpu_num]
 
 
+class _StopSignal:
+    """Latch for SIGINT/SIGTERM that the watch loop sleeps on.
+
+    The handlers only record the signal, so nothing is raised in the middle of a
+    subprocess wait; the wakeup fd (a self-pipe) cuts a pending `wait` short.
+    """
+
+    def __init__(self) -> None:
+        self.stopped = False
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        os.set_blocking(self._w, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._r, selectors.EVENT_READ)
+        self._prev_wakeup_fd = signal.set_wakeup_fd(self._w)
+        self._prev_handlers = {
+            signal.SIGINT: signal.signal(signal.SIGINT, self._handle),
+            signal.SIGTERM: signal.signal(signal.SIGTERM, self._handle),
+        }
+
+    def __enter__(self) -> _StopSignal:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Restore the previous handlers and wakeup fd, and release the pipe."""
+        for sig, handler in self._prev_handlers.items():
+            signal.signal(sig, handler)
+        signal.set_wakeup_fd(self._prev_wakeup_fd)
+        self._selector.close()
+        os.close(self._r)
+        os.close(self._w)
+
+    def _handle(self, signum, frame) -> None:
+        self.stopped = True
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`; returns True (early) once a stop signal has arrived."""
+        deadline = time.monotonic() + seconds
+        while not self.stopped:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._selector.select(timeout=remaining):
+                try:
+                    os.read(self._r, 512)
+                except BlockingIOError:
+                    pass
+        return self.stopped
+
+
 @dataclass
 class WatchConfig:
     version: str  # v4/v5/v6
@@ -33,11 +89,7 @@ class WatchConfig:
 
 
 def _build_setup_script(version: str, env: TPUEnvConfig) -> str:
-    bucket_env = {
-        "v4": env.tpu_bucket_v4,
-        "v5": env.tpu_bucket_v5,
-        "v6": env.tpu_bucket_v6,
-    }[version]
+    bucket_env = env.buckets[version]
     setup_tpl = Template(r"""set -euo pipefail
 
             # 1. Set up environment variables
@@ -141,13 +193,19 @@ def _build_setup_script(version: str, env: TPUEnvConfig) -> str:
     )
 
 
+@functools.cache
+def _setup_script_bytes(version: str, env: TPUEnvConfig) -> bytes:
+    return _build_setup_script(version, env).encode()
+
+
+@functools.cache
 def build_setup_cmd(version: str, env: TPUEnvConfig) -> str:
     """Build the remote setup command identical to watch()'s setup step.
 
-    Returns a shell command suitable for execution over SSH.
+    Returns a shell command suitable for execution over SSH. Memoized per
+    (version, env); TPUEnvConfig is frozen, so the script can't go stale.
     """
-    setup_script = _build_setup_script(version, env)
-    encoded = base64.b64encode(setup_script.encode()).decode().replace("\n", "")
+    encoded = base64.b64encode(_setup_script_bytes(version, env)).decode()
     return f"bash -lc 'echo {encoded} | base64 -d | bash -l -s'"
 
 
@@ -157,8 +215,37 @@ def run_setup(version: str, env: TPUEnvConfig, *, worker: str | None = "all") ->
     This is exposed so callers can do: `tpu v4 setup`.
     """
     mgr = TPUManager(env)
-    setup_cmd = build_setup_cmd(version, env)
-    return mgr.raw(version, cmd=setup_cmd, worker=worker)
+    if worker != "all":
+        # A single worker takes the script on stdin as-is, no base64 round-trip
+        return mgr.raw(version, cmd="bash -l -s", worker=worker, input=_setup_script_bytes(version, env))
+    return mgr.raw(version, cmd=build_setup_cmd(version, env), worker=worker)
+
+
+def _wait_until_ready(mgr: TPUManager, version: str, stop: _StopSignal, timeout_s: float = 600) -> bool:
+    """Poll describe with exponential backoff (2s doubling up to 20s) until READY.
+
+    Returns False on timeout, on a stop signal, or once the TPU leaves CREATING.
+    """
+    deadline = time.monotonic() + timeout_s
+    delay = 2.0
+    while True:
+        # Skip the describe cache: each poll must see the live state
+        invalidate_describe(mgr.env.tpu_name)
+        try:
+            state = mgr.describe(version)
+        except Exception as exc:
+            print(str(exc))
+            state = "ERROR"
+        if state == "READY":
+            return True
+        # ERROR is a failed describe call, not a TPU state; keep polling through it
+        if state not in {"CREATING", "STARTING", "RESTARTING", "ERROR"}:
+            print(f"{_ts()} - TPU went to {state} while waiting for READY.")
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or stop.wait(min(delay, remaining)):
+            return False
+        delay = min(delay * 2, 20.0)
 
 
 def watch_and_run(cfg: WatchConfig, env: TPUEnvConfig) -> None:
@@ -166,11 +253,11 @@ def watch_and_run(cfg: WatchConfig, env: TPUEnvConfig) -> None:
 
     print("Starting TPU auto-launcher with:")
     print(f"  TPU Name: {env.tpu_name}")
-    print(f"  Zone: {getattr(env, f'tpu_zone_{cfg.version}')}")
+    print(f"  Zone: {env.zones[cfg.version]}")
     print(f"  Project: {env.tpu_project}")
     print(f"  Service Account: {env.tpu_service_account}")
     print(f"  Repo Name: {env.gh_repo_name}")
-    bucket = getattr(env, f"tpu_bucket_{cfg.version}")
+    bucket = env.buckets[cfg.version]
     print(f"  Bucket: {bucket}")
     print(f"  TPU Num: {cfg.tpu_num}")
     if cfg.version == "v4":
@@ -180,80 +267,90 @@ def watch_and_run(cfg: WatchConfig, env: TPUEnvConfig) -> None:
         print(f"  Extra args: {' '.join(cfg.extra_args)}")
     print()
 
-    def handle_sig(signum, frame):
-        print(f"{_ts()} - Caught signal, exiting.")
-        raise SystemExit(0)
-
-    signal.signal(signal.SIGINT, handle_sig)
-    signal.signal(signal.SIGTERM, handle_sig)
-
-    while True:
-        print(f"{_ts()} - Checking TPU state...")
-        try:
-            state = mgr.describe(cfg.version)
-        except Exception as exc:
-            print(str(exc))
-            sleep(mgr.sleep_secs)
-            continue
-
-        print(f"{_ts()} - TPU {env.tpu_name} state: {state}")
-
-        run_setup_and_training = False
-
-        if state in {"NOT_FOUND", "PREEMPTED", "STOPPED"}:
-            print(f"{_ts()} - Need to (re)create TPU...")
-            if state != "NOT_FOUND" and not mgr.delete(cfg.version):
-                print(f"{_ts()} - Delete failed/timed out.")
-                sleep(mgr.sleep_secs)
-                continue
-            print(f"{_ts()} - Creating new TPU...")
-            topo = _map_v4_topology(cfg.tpu_num) if cfg.version == "v4" else None
-            if not mgr.create(cfg.version, tpu_num=cfg.tpu_num, topology=topo):
-                print(f"{_ts()} - Create failed/timed out.")
-                sleep(mgr.sleep_secs)
-                continue
-            print(f"{_ts()} - Waiting for TPU to be READY...")
-            sleep(10)
-            run_setup_and_training = True
-        elif state == "PERMISSION_DENIED":
-            print(f"{_ts()} - PERMISSION_DENIED from describe. Check IAM/API enablement.")
-            sleep(mgr.sleep_secs)
-            continue
-        elif state == "READY":
-            run_setup_and_training = cfg.force_run
-        else:
-            print(f"{_ts()} - TPU in state: {state} (not actionable now).")
-            sleep(mgr.sleep_secs)
-            continue
-
-        if run_setup_and_training:
-            print(f"{_ts()} - Setting up environment and repository...")
-            rc = run_setup(cfg.version, env, worker="all")
-            if rc != 0:
-                print(f"{_ts()} - Setup failed (rc={rc}). See above for remote logs. Back to state check.")
-                sleep(mgr.sleep_secs)
+    # Set once a TPU was (re)created and cleared once training launched, so a launch
+    # still happens on a later READY if this iteration couldn't get there.
+    launch_pending = False
+
+    with _StopSignal() as stop:
+        while not stop.stopped:
+            print(f"{_ts()} - Checking TPU state...")
+            try:
+                state = mgr.describe(cfg.version)
+            except Exception as exc:
+                print(str(exc))
+                stop.wait(mgr.sleep_secs)
                 continue
 
-            print(f"{_ts()} - Starting training...")
-            extra = " ".join(cfg.extra_args) if cfg.extra_args else ""
-            # Add set -x to echo commands in the training pipeline and preserve stderr/stdout
-            train_cmd = (
-                f"source ~/.zshrc && cd {env.gh_repo_name} && "
-                "git pull origin main && "
-                "XLA_PYTHON_CLIENT_MEM_FRACTION=0.95 "
-                f"uv run --group tpu scripts/train.py {extra}"
-            )
-            if not mgr.tmux(cfg.version, cmd=train_cmd, session="tpu"):
-                print(f"{_ts()} - Launch failed/SSH timed out. Back to state check.")
-                sleep(mgr.sleep_secs)
+            print(f"{_ts()} - TPU {env.tpu_name} state: {state}")
+
+            run_setup_and_training = False
+
+            if state in {"NOT_FOUND", "PREEMPTED", "STOPPED"}:
+                print(f"{_ts()} - Need to (re)create TPU...")
+                if state != "NOT_FOUND" and not mgr.delete(cfg.version):
+                    print(f"{_ts()} - Delete failed/timed out.")
+                    stop.wait(mgr.sleep_secs)
+                    continue
+                print(f"{_ts()} - Creating new TPU...")
+                topo = _map_v4_topology(cfg.tpu_num) if cfg.version == "v4" else None
+                if not mgr.create(cfg.version, tpu_num=cfg.tpu_num, topology=topo):
+                    print(f"{_ts()} - Create failed/timed out.")
+                    stop.wait(mgr.sleep_secs)
+                    continue
+                if stop.stopped:
+                    break
+                launch_pending = True
+                print(f"{_ts()} - Waiting for TPU to be READY...")
+                if not _wait_until_ready(mgr, cfg.version, stop):
+                    print(f"{_ts()} - TPU not READY. Back to state check.")
+                    continue
+                if stop.stopped:
+                    break
+                run_setup_and_training = True
+            elif state == "PERMISSION_DENIED":
+                print(f"{_ts()} - PERMISSION_DENIED from describe. Check IAM/API enablement.")
+                stop.wait(mgr.sleep_secs)
+                continue
+            elif state == "READY":
+                run_setup_and_training = cfg.force_run or launch_pending
+            else:
+                print(f"{_ts()} - TPU in state: {state} (not actionable now).")
+                stop.wait(mgr.sleep_secs)
                 continue
 
-            print(f"{_ts()} - Training started successfully!")
-            if cfg.force_run:
-                print(f"{_ts()} - Force run requested; exiting.")
-                return
+            if run_setup_and_training:
+                print(f"{_ts()} - Setting up environment and repository...")
+                rc = run_setup(cfg.version, env, worker="all")
+                if rc != 0:
+                    print(f"{_ts()} - Setup failed (rc={rc}). See above for remote logs. Back to state check.")
+                    stop.wait(mgr.sleep_secs)
+                    continue
+                if stop.stopped:
+                    break
+
+                print(f"{_ts()} - Starting training...")
+                extra = " ".join(cfg.extra_args) if cfg.extra_args else ""
+                # Add set -x to echo commands in the training pipeline and preserve stderr/stdout
+                train_cmd = (
+                    f"source ~/.zshrc && cd {env.gh_repo_name} && "
+                    "git pull origin main && "
+                    "XLA_PYTHON_CLIENT_MEM_FRACTION=0.95 "
+                    f"uv run --group tpu scripts/train.py {extra}"
+                )
+                if not mgr.tmux(cfg.version, cmd=train_cmd, session="tpu"):
+                    print(f"{_ts()} - Launch failed/SSH timed out. Back to state check.")
+                    stop.wait(mgr.sleep_secs)
+                    continue
+
+                launch_pending = False
+                print(f"{_ts()} - Training started successfully!")
+                if cfg.force_run:
+                    print(f"{_ts()} - Force run requested; exiting.")
+                    return
+
+            stop.wait(mgr.sleep_secs)
 
-        sleep(mgr.sleep_secs)
+        print(f"{_ts()} - Caught signal, exiting.")
 
 
 def build_arg_parser() -> argparse.ArgumentParser: